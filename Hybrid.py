@@ -6,40 +6,53 @@ from sklearn.metrics.pairwise import linear_kernel
 from surprise import Dataset, Reader, SVD
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
-
-# ---------- Load and Prepare Data ----------
-
-cf_df = pd.read_csv("user_steam.csv", header=None)
-cf_df.columns = ["user_id", "game", "behavior", "value", "timestamp"]
-
-print(cf_df.head())
-
-cf_df = cf_df[cf_df["behavior"] == "play"]
-cf_df = cf_df.groupby(["user_id", "game"])["value"].sum().reset_index()
-cf_df.rename(columns={"value": "playtime_hours"}, inplace=True)
-
-content_df = pd.read_csv("steam.csv")
-content_df = content_df[["appid", "name", "genres", "developer", "publisher", "categories"]].dropna()
-content_df.drop_duplicates(subset="name", inplace=True)
-
-# Normalize for joining
-content_df["name_lower"] = content_df["name"].str.lower()
-cf_df["game_lower"] = cf_df["game"].str.lower()
-merged_df = pd.merge(cf_df, content_df, left_on="game_lower", right_on="name_lower")
-
-# Content-based filtering setup
-content_df["combined"] = content_df["genres"] + " " + content_df["developer"] + " " + content_df["categories"]
-tfidf = TfidfVectorizer(stop_words='english')
-tfidf_matrix = tfidf.fit_transform(content_df["combined"])
-cosine_sim = linear_kernel(tfidf_matrix, tfidf_matrix)
-indices = pd.Series(content_df.index, index=content_df["name"]).drop_duplicates()
-
-# Collaborative filtering setup
-reader = Reader(rating_scale=(0, cf_df["playtime_hours"].max()))
-data = Dataset.load_from_df(merged_df[["user_id", "name", "playtime_hours"]], reader)
-trainset = data.build_full_trainset()
-algo = SVD()
-algo.fit(trainset)
+from sharded_catalog import ShardedCatalog
+
+# how many worker processes share the content catalog (1 = everything in this process)
+NUM_SHARDS = 1
+
+if __name__ == '__main__':
+    # ---------- Load and Prepare Data ----------
+
+    cf_df = pd.read_csv("user_steam.csv", header=None)
+    cf_df.columns = ["user_id", "game", "behavior", "value", "timestamp"]
+
+    print(cf_df.head())
+
+    cf_df = cf_df[cf_df["behavior"] == "play"]
+    cf_df = cf_df.groupby(["user_id", "game"])["value"].sum().reset_index()
+    cf_df.rename(columns={"value": "playtime_hours"}, inplace=True)
+
+    content_df = pd.read_csv("steam.csv")
+    content_df = content_df[["appid", "name", "genres", "developer", "publisher", "categories"]].dropna()
+    content_df.drop_duplicates(subset="name", inplace=True)
+
+    # Normalize for joining
+    content_df["name_lower"] = content_df["name"].str.lower()
+    cf_df["game_lower"] = cf_df["game"].str.lower()
+    merged_df = pd.merge(cf_df, content_df, left_on="game_lower", right_on="name_lower")
+
+    # Content-based filtering setup
+    content_df["combined"] = content_df["genres"] + " " + content_df["developer"] + " " + content_df["categories"]
+    tfidf = TfidfVectorizer(stop_words='english')
+    tfidf.fit(content_df["combined"])
+    if NUM_SHARDS > 1:
+        # each worker turns its own games into numbers, this process keeps no TF-IDF matrix or similarity table
+        cosine_sim = None
+        catalog = ShardedCatalog(tfidf, content_df["combined"], NUM_SHARDS)
+    else:
+        # fit then transform, like the shards do, so both modes give exactly the same scores
+        tfidf_matrix = tfidf.transform(content_df["combined"])
+        cosine_sim = linear_kernel(tfidf_matrix, tfidf_matrix)
+        catalog = None
+    indices = pd.Series(content_df.index, index=content_df["name"]).drop_duplicates()
+
+    # Collaborative filtering setup
+    reader = Reader(rating_scale=(0, cf_df["playtime_hours"].max()))
+    data = Dataset.load_from_df(merged_df[["user_id", "name", "playtime_hours"]], reader)
+    trainset = data.build_full_trainset()
+    algo = SVD()
+    algo.fit(trainset)
 
 # ---------- Recommender Functions ----------
 
@@ -47,8 +60,12 @@ def content_recommendations(title, top_n=10):
     idx = indices.get(title)
     if idx is None:
         return []
-    sim_scores = list(enumerate(cosine_sim[idx]))
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)[1:top_n+1]
+    if catalog is not None:
+        # scatter to every shard and merge their best games (one extra, the game itself comes first)
+        sim_scores = catalog.similar_to_row(idx, top_n+1)[1:]
+    else:
+        sim_scores = list(enumerate(cosine_sim[idx]))
+        sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)[1:top_n+1]
     game_indices = [i[0] for i in sim_scores]
     return content_df.iloc[game_indices]["name"].tolist()
 
@@ -183,35 +200,40 @@ def display_score_chart(recommendations):
     canvas.draw()
     canvas.get_tk_widget().pack(fill=BOTH, expand=True)
 
-root = Tk()
-root.title("Steam Game Recommender")
-root.geometry("700x700")
+if __name__ == '__main__':
+    root = Tk()
+    root.title("Steam Game Recommender")
+    root.geometry("700x700")
+
+    # Title
+    Label(root, text="🎮 Hybrid Recommender System", font=("Roboto", 18)).pack(pady=10)
 
-# Title
-Label(root, text="🎮 Hybrid Recommender System", font=("Roboto", 18)).pack(pady=10)
+    Label(root, text="Enter User ID:").pack(pady=5)
+    user_entry = Entry(root, width=50)
+    user_entry.pack()
 
-Label(root, text="Enter User ID:").pack(pady=5)
-user_entry = Entry(root, width=50)
-user_entry.pack()
+    Label(root, text="Enter a Game You Like:").pack(pady=5)
+    game_entry = Entry(root, width=50)
+    game_entry.pack()
 
-Label(root, text="Enter a Game You Like:").pack(pady=5)
-game_entry = Entry(root, width=50)
-game_entry.pack()
+    Label(root, text="Number of Recommendations:").pack(pady=5)
+    rec_slider = Scale(root, from_=1, to=10, orient=HORIZONTAL)
+    rec_slider.set(5)  
+    rec_slider.pack()
 
-Label(root, text="Number of Recommendations:").pack(pady=5)
-rec_slider = Scale(root, from_=1, to=10, orient=HORIZONTAL)
-rec_slider.set(5)  
-rec_slider.pack()
+    Button(root, text="Get Recommendations", command=get_recommendations).pack(pady=10)
 
-Button(root, text="Get Recommendations", command=get_recommendations).pack(pady=10)
+    Label(root, text="Recommendations:").pack()
+    output = Text(root, height=20, width=80)
+    output.pack()
 
-Label(root, text="Recommendations:").pack()
-output = Text(root, height=20, width=80)
-output.pack()
+    Label(root, text="Score Breakdown Chart:").pack()
+    chart_frame = Frame(root)
+    chart_frame.pack()
 
-Label(root, text="Score Breakdown Chart:").pack()
-chart_frame = Frame(root)
-chart_frame.pack()
 
+    root.mainloop()
 
-root.mainloop()
+    # stop the shard workers when the window is closed
+    if catalog is not None:
+        catalog.close()
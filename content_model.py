@@ -0,0 +1,37 @@
+# Shared pieces of the content-based model, used by Content-Based RS 2.0.py and sharded_catalog.py
+# so the app and the benchmark always build the same features and rank games the same way
+import numpy as np
+import pandas as pd
+
+
+# ------------------------- Preprocessing function --------------------------------
+def clean_text(x):
+    if pd.isna(x): # if the input is empty or missing (like nothing id written)
+        return '' # return an empty string so computer doesn't get confused
+
+    # take the text make all letters small, replace any , and ; with space so it looks clean
+    return str(x).lower().replace(',', ' ').replace(';', ' ')
+
+def add_combined_features(df):
+    # take some columns, fill in missing ones with an empty string, glue them tgt with space between, then clean text using clean_text helper
+    df['genres'] = df['genres'].str.replace(';', ', ', regex=False)
+    df['combined_features'] = df[['genres', 'steamspy_tags', 'developer']].fillna('').agg(' '.join, axis=1).apply(clean_text)
+    return df
+
+# ------------------------- Single-process ranking --------------------------------
+# gives back (row number, similarity score) of the most similar games from one row of the full similarity table
+def most_similar(sim_row, num_recommendations):
+    # pair each score with game's index
+    sim_scores = list(enumerate(sim_row))
+
+    # sort list so most simlar games come first (from highest to lowest score)
+    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
+
+    # skip the first one (which is game itself!) and keep only number of recommendation the user asked for
+    return sim_scores[1:num_recommendations+1]
+
+# gives back (row number, similarity score) of the best matches for a preference search
+def best_matches(sim_scores, num):
+    # gets the best scores (the most similar ones), equal scores keep table order so every mode agrees
+    top_indices = np.argsort(-sim_scores, kind='stable')[:num]
+    return [(i, sim_scores[i]) for i in top_indices]
@@ -0,0 +1,248 @@
+# Sharded TF-IDF catalog: split the games into partitions, each served by its own worker process
+# Queries are scattered to every shard, each shard sends back its local top-N, and we merge them with a heap
+import bisect
+import heapq
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import linear_kernel
+
+
+# ------------------------------- Helpers -------------------------------------
+def memory_mb():
+    # memory the current process is using right now in MB (None if we can't measure it on this OS)
+    # not the peak: a spawned worker would report the peak of the process that started it
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def matrix_mb(matrix):
+    # how much memory a sparse matrix slice takes (values + column numbers + row pointers)
+    return (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / (1024 * 1024)
+
+
+def top_n(scores, n, offset=0):
+    # best n scores, highest first; equal scores keep the lower row number first
+    # (same order as the single-process sorted(..., reverse=True) which is a stable sort)
+    order = np.argsort(-scores, kind='stable')[:n]
+    return [(offset + i, scores[i]) for i in order]
+
+
+# ------------------------------- Shard worker -------------------------------------
+def handle_message(tfidf_slice, offset, message):
+    kind = message[0]
+
+    # compare a query to every game in this shard and give back the local top-N
+    if kind == 'query':
+        _, query_vec, n = message
+        scores = linear_kernel(query_vec, tfidf_slice).flatten()
+        return top_n(scores, n, offset)
+
+    # give back the vector of one of our games, so the coordinator doesn't need the whole matrix
+    if kind == 'row':
+        return tfidf_slice[message[1]]
+
+    if kind == 'stats':
+        return {'rows': tfidf_slice.shape[0],
+                'matrix_mb': matrix_mb(tfidf_slice),
+                'memory_mb': memory_mb()}
+
+    raise ValueError(f"Unknown message '{kind}'.")
+
+
+# runs inside each worker process, only ever holds its own slice of the TF-IDF matrix
+def shard_worker(conn, vectorizer, texts, offset):
+    # each worker turns only its own games into numbers (transform works row by row, so this matches
+    # transforming the whole catalog at once)
+    tfidf_slice = vectorizer.transform(texts)
+    del texts
+
+    while True:
+        message = conn.recv()
+
+        # None means the catalog is shutting down
+        if message is None:
+            break
+
+        # every message gets exactly one reply, even when something goes wrong,
+        # so the coordinator never pairs a query with the wrong answer
+        try:
+            reply = ('ok', handle_message(tfidf_slice, offset, message))
+        except Exception as e:
+            reply = ('error', e)
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # the result or the error couldn't be pickled, send something that can
+            conn.send(('error', RuntimeError(f"Shard at row {offset} could not send its reply: {e!r}")))
+
+    conn.close()
+
+
+# ------------------------------- Sharded catalog -------------------------------------
+class ShardedCatalog:
+    def __init__(self, vectorizer, texts, num_shards):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1.")
+
+        # always spawn fresh processes so each worker only holds its own slice (same behaviour on every OS)
+        ctx = mp.get_context('spawn')
+        texts = list(texts)
+
+        # split rows into contiguous blocks, so global row number = shard offset + local row number
+        self.bounds = [int(b) for b in np.linspace(0, len(texts), min(num_shards, len(texts)) + 1)]
+
+        self.connections = []
+        self.workers = []
+        for start, end in zip(self.bounds[:-1], self.bounds[1:]):
+            parent_conn, child_conn = ctx.Pipe()
+            worker = ctx.Process(target=shard_worker, args=(child_conn, vectorizer, texts[start:end], start), daemon=True)
+            worker.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.workers.append(worker)
+
+    def _ask(self, connections, message):
+        # scatter: send the message to every shard first so they all work at the same time
+        sent = []
+        errors = []
+        for conn in connections:
+            try:
+                conn.send(message)
+                sent.append(conn)
+            except OSError as e:
+                errors.append(RuntimeError(f"A shard worker is not running: {e!r}"))
+
+        # gather: read a reply from every shard we sent to before raising, so no answer is left in a pipe
+        replies = []
+        for conn in sent:
+            try:
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                errors.append(RuntimeError("A shard worker stopped unexpectedly."))
+                continue
+
+            if status == 'error':
+                errors.append(payload)
+            else:
+                replies.append(payload)
+
+        if errors:
+            raise errors[0]
+        return replies
+
+    def similar(self, query_vec, n):
+        # each shard returns its local top-N already sorted, merge them with a heap and keep the global top-N
+        shard_results = self._ask(self.connections, ('query', query_vec, n))
+        merged = heapq.merge(*shard_results, key=lambda x: (-x[1], x[0]))
+        return [item for _, item in zip(range(n), merged)]
+
+    def row_vector(self, row):
+        # find which shard owns this row and ask it for the game's vector
+        if not 0 <= row < self.bounds[-1]:
+            raise IndexError(f"Row {row} is not in the catalog.")
+        shard = bisect.bisect_right(self.bounds, row) - 1
+        return self._ask([self.connections[shard]], ('row', int(row) - self.bounds[shard]))[0]
+
+    def similar_to_row(self, row, n):
+        # games most similar to the game at this row (the game itself is included, like a row of cosine_sim)
+        return self.similar(self.row_vector(row), n)
+
+    def stats(self):
+        return self._ask(self.connections, ('stats',))
+
+    def close(self):
+        for conn in self.connections:
+            try:
+                conn.send(None)
+            except OSError:
+                pass  # worker already gone
+            conn.close()
+        for worker in self.workers:
+            worker.join()
+        self.connections = []
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------------------- Benchmark -------------------------------------
+def run_benchmark(label, texts, preferences, shard_counts, num_queries=200, num_recommendations=10):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from content_model import best_matches, most_similar
+
+    vectorizer = TfidfVectorizer(stop_words='english').fit(texts)
+    query_rows = np.random.default_rng(0).choice(len(texts), size=min(num_queries, len(texts)), replace=False)
+    print(f"--- {label}: {len(texts)} games, {len(query_rows)} title queries, {len(preferences)} preference queries")
+
+    # sharded runs first, while this process holds no TF-IDF matrix at all
+    sharded = {}
+    for num_shards in shard_counts:
+        with ShardedCatalog(vectorizer, texts, num_shards) as catalog:
+            start = time.perf_counter()
+            results = [catalog.similar_to_row(i, num_recommendations + 1)[1:] for i in query_rows]
+            elapsed = time.perf_counter() - start
+            pref_results = [catalog.similar(vectorizer.transform([p]), num_recommendations) for p in preferences]
+            stats = catalog.stats()
+            coordinator_memory = memory_mb()
+
+        sharded[num_shards] = (results, pref_results)
+        print(f"{num_shards:3d} shard(s)    : {len(query_rows) / elapsed:8.1f} queries/s, "
+              f"coordinator {coordinator_memory or 0:.1f} MB, "
+              f"largest worker {max(s['memory_mb'] or 0 for s in stats):.1f} MB "
+              f"(largest slice {max(s['matrix_mb'] for s in stats):.1f} MB)")
+
+    # single process, built exactly like the app does it: the whole matrix and the full similarity table
+    tfidf_matrix = vectorizer.transform(texts)
+    cosine_sim = linear_kernel(tfidf_matrix, tfidf_matrix)
+    start = time.perf_counter()
+    expected = [most_similar(cosine_sim[i], num_recommendations) for i in query_rows]
+    elapsed = time.perf_counter() - start
+    expected_prefs = [best_matches(linear_kernel(vectorizer.transform([p]), tfidf_matrix).flatten(), num_recommendations)
+                      for p in preferences]
+    print(f"single process : {len(query_rows) / elapsed:8.1f} queries/s, memory {memory_mb() or 0:.1f} MB "
+          f"(matrix {matrix_mb(tfidf_matrix):.1f} MB + similarity table {cosine_sim.nbytes / (1024 * 1024):.1f} MB)")
+
+    for num_shards, (results, pref_results) in sharded.items():
+        if results != expected:
+            raise SystemExit(f"{num_shards} shard(s): title recommendations differ from the single-process path!")
+        if pref_results != expected_prefs:
+            raise SystemExit(f"{num_shards} shard(s): preference recommendations differ from the single-process path!")
+    print("all shard counts match the single-process results exactly")
+
+
+# python sharded_catalog.py [shard counts...]
+# e.g. python sharded_catalog.py 1 2 4 8
+# note: the single-process check builds the full similarity table like the app does, so it needs that much RAM
+if __name__ == '__main__':
+    import pandas as pd
+    from content_model import add_combined_features, clean_text
+
+    shard_counts = [int(x) for x in sys.argv[1:]] or [1, 2, 4]
+
+    # same features as Content-Based RS 2.0.py
+    df = add_combined_features(pd.read_csv('steam.csv'))
+    texts = df['combined_features'].tolist()
+
+    # preference searches like a user would type them: a developer, some tags, and one that matches nothing
+    rng = np.random.default_rng(1)
+    picked = df.iloc[rng.choice(len(df), size=10, replace=False)]
+    preferences = ([clean_text(x) for x in picked['developer']] + [clean_text(x) for x in picked['steamspy_tags']]
+                   + [clean_text('no such game words')])
+
+    run_benchmark('steam.csv', texts, preferences, shard_counts)
+
+    # every game three times: lots of equal scores, so the tie order has to match too
+    run_benchmark('steam.csv with ties', texts[:2000] * 3, preferences, [max(shard_counts)])